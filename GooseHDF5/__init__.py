@@ -11,20 +11,24 @@ import sys
 import uuid
 import warnings
 from difflib import SequenceMatcher
+from typing import TYPE_CHECKING
 from typing import Iterator
 
 import h5py
 import numpy as np
-import prettytable
-import yaml
 from numpy.typing import ArrayLike
-from termcolor import colored
 
 from ._version import version  # noqa: F401
 from ._version import version_tuple  # noqa: F401
 
+if TYPE_CHECKING:
+    import prettytable
+
 warnings.filterwarnings("ignore")
 
+# Raw-data chunk cache used by the command-line tools that read every dataset (once).
+_rdcc = dict(rdcc_nbytes=64 * 1024 * 1024, rdcc_nslots=100003, rdcc_w0=0.75)
+
 
 class ExtendableSlice:
     """
@@ -90,8 +94,7 @@ class ExtendableSlice:
             )
 
         if attrs is not None:
-            for attr in attrs:
-                self.dset.attrs[attr] = attrs[attr]
+            self.dset.attrs.update(attrs)
 
         self.dset.parent.file.flush()
 
@@ -192,8 +195,7 @@ class ExtendableList:
             )
 
         if attrs is not None:
-            for attr in attrs:
-                self.dset.attrs[attr] = attrs[attr]
+            self.dset.attrs.update(attrs)
 
         self.dset.parent.file.flush()
 
@@ -458,8 +460,17 @@ def getdatapaths(
     :return: List of paths (always absolute, so includes the ``root`` if used).
     """
     kwargs = dict(root=root, max_depth=max_depth, fold=fold, fold_symbol=fold_symbol)
-    ret = list(getdatasets(file, **kwargs)) + list(getgroups(file, has_attrs=True, **kwargs))
-    return list(set(ret))
+    ret = set(getdatasets(file, **kwargs))
+    ret.update(getgroups(file, has_attrs=True, **kwargs))
+    return list(ret)
+
+
+def _num_attrs(obj: h5py.Group | h5py.Dataset) -> int:
+    """
+    Number of attributes of a group or dataset.
+    Uses the low-level API to avoid constructing an ``AttributeManager``.
+    """
+    return h5py.h5a.get_num_attrs(obj.id)
 
 
 def getgroups(
@@ -498,12 +509,13 @@ def getgroups(
         fold = [f if f.startswith(root) else join(root, f) for f in fold]
 
     keys = []
-    group = file[root]
-    group.visit(lambda key: keys.append(key) if isinstance(group[key], h5py.Group) else None)
-    keys = [join(root, key) for key in keys]
 
-    if has_attrs:
-        keys = [key for key in keys if len(file[key].attrs) > 0]
+    def collect(key, obj):
+        if isinstance(obj, h5py.Group):
+            if not has_attrs or _num_attrs(obj) > 0:
+                keys.append(join(root, key))
+
+    file[root].visititems(collect)
 
     if max_depth is not None:
         n = len(list(filter(None, root.split("/"))))
@@ -600,6 +612,23 @@ def getdatasets(
     return _getpaths(file, root)
 
 
+def _getclass(group: h5py.Group, name: str):
+    """
+    Class of ``group[name]`` (following links) without opening the object.
+
+    :param group: A group.
+    :param name: Name of a member of ``group``.
+    :return: The class (e.g. ``h5py.Dataset``), or ``None`` for a dangling link.
+    """
+    try:
+        return group.get(name, getclass=True)
+    except (KeyError, RuntimeError):
+        link = group.get(name, getlink=True)
+        if isinstance(link, h5py.SoftLink) and link.path not in group:
+            return None
+        raise
+
+
 def _getpaths(file, root):
     """
     Specialization for :py:func:`getpaths`.
@@ -609,14 +638,17 @@ def _getpaths(file, root):
 
     def iterator(g, prefix):
         for key in g.keys():
-            item = g[key]
+            cls = _getclass(g, key)
+            if cls is None:
+                continue
+
             path = join(prefix, key)
 
-            if isinstance(item, h5py.Dataset):
+            if cls is h5py.Dataset:
                 yield path
 
-            elif isinstance(item, h5py.Group):
-                yield from iterator(item, path)
+            elif cls is h5py.Group:
+                yield from iterator(g[key], path)
 
     # ---------------------------------------------
 
@@ -637,20 +669,23 @@ def _getpaths_maxdepth(file, root, max_depth, fold_symbol):
 
     def iterator(g, prefix, max_depth):
         for key in g.keys():
-            item = g[key]
+            cls = _getclass(g, key)
+            if cls is None:
+                continue
+
             path = join(prefix, key)
 
-            if isinstance(item, h5py.Dataset):
+            if cls is h5py.Dataset:
                 yield path
 
             elif len(path.split("/")) - 1 >= max_depth:
-                if len(list(iterator(item, path, max_depth + 1))) > 0:
+                if len(list(iterator(g[key], path, max_depth + 1))) > 0:
                     yield path + fold_symbol
                 else:
                     yield path
 
-            elif isinstance(item, h5py.Group):
-                yield from iterator(item, path, max_depth)
+            elif cls is h5py.Group:
+                yield from iterator(g[key], path, max_depth)
 
     # ---------------------------------------------
 
@@ -674,17 +709,20 @@ def _getpaths_fold(file, root, fold, fold_symbol):
 
     def iterator(g, prefix, fold):
         for key in g.keys():
-            item = g[key]
+            cls = _getclass(g, key)
+            if cls is None:
+                continue
+
             path = join(prefix, key)
 
-            if isinstance(item, h5py.Dataset):
+            if cls is h5py.Dataset:
                 yield path
 
             elif path in fold:
                 yield path + fold_symbol
 
-            elif isinstance(item, h5py.Group):
-                yield from iterator(item, path, fold)
+            elif cls is h5py.Group:
+                yield from iterator(g[key], path, fold)
 
     # ---------------------------------------------
 
@@ -709,10 +747,13 @@ def _getpaths_fold_maxdepth(file, root, fold, max_depth, fold_symbol):
 
     def iterator(g, prefix, fold, max_depth):
         for key in g.keys():
-            item = g[key]
+            cls = _getclass(g, key)
+            if cls is None:
+                continue
+
             path = join(prefix, key)
 
-            if isinstance(item, h5py.Dataset):
+            if cls is h5py.Dataset:
                 yield path
 
             elif len(path.split("/")) - 1 >= max_depth:
@@ -721,8 +762,8 @@ def _getpaths_fold_maxdepth(file, root, fold, max_depth, fold_symbol):
             elif path in fold:
                 yield path + fold_symbol
 
-            elif isinstance(item, h5py.Group):
-                yield from iterator(item, path, fold, max_depth)
+            elif cls is h5py.Group:
+                yield from iterator(g[key], path, fold, max_depth)
 
     # ---------------------------------------------
 
@@ -747,12 +788,8 @@ def filter_datasets(file, paths):
     :return: Filtered ``paths``.
     """
 
-    import re
-
-    paths = list(paths)
-    paths = [path for path in paths if not re.match(r"(.*)(/\.\.\.)", path)]
-    paths = [path for path in paths if isinstance(file[path], h5py.Dataset)]
-    return paths
+    paths = [path for path in paths if "/..." not in path]
+    return [path for path in paths if isinstance(file[path], h5py.Dataset)]
 
 
 def verify(file, datasets, error=False):
@@ -843,8 +880,7 @@ def _create_groups(file, paths):
     For ``path = ["/a/b/c"]`` this function will create groups ``["/a", "/a/b"]``.
     """
 
-    groups = [posixpath.split(path)[0] for path in paths]
-    groups = [group for group in groups if group != "/"]
+    groups = {posixpath.split(path)[0] for path in paths} - {"/"}
     groups = sorted(groups, key=lambda group: (group.count("/"), group))
 
     for group in groups:
@@ -933,11 +969,14 @@ def copy(
         return 0
 
     _create_groups(dest, dest_paths)
-    isgroup = np.array([isinstance(source[path], h5py.Group) for path in source_paths])
+    isgroup = [source.get(path, getclass=True) is h5py.Group for path in source_paths]
+    isgroup = np.array(isgroup, dtype=bool)
     keep = np.ones(len(source_paths), dtype=bool)
     if shallow:
         keep[isgroup] = False
 
+    parents = {}
+
     for source_path, dest_path in zip(source_paths[keep], dest_paths[keep]):
         if dest_path in dest:
             continue
@@ -946,11 +985,13 @@ def copy(
             if isinstance(link, h5py.SoftLink):
                 dest[dest_path] = h5py.SoftLink(link.path)
                 continue
-        group = posixpath.split(dest_path)[0]
+        group, name = posixpath.split(dest_path)
+        if group not in parents:
+            parents[group] = dest[group]
         source.copy(
             source=source_path,
-            dest=dest[group],
-            name=posixpath.split(dest_path)[1],
+            dest=parents[group],
+            name=name,
             shallow=shallow,
             expand_soft=expand_soft,
             expand_external=expand_external,
@@ -963,16 +1004,15 @@ def copy(
             dest_group = dest.create_group(dest_path)
         else:
             dest_group = dest[dest_path]
-        source_group = source[source_path]
-        for key in source_group.attrs:
-            dest_group.attrs[key] = source_group.attrs[key]
+        dest_group.attrs.update(source[source_path].attrs)
 
 
 def isnumeric(a):
     """
     Returns ``True`` is an array contains numeric values.
+    Only the data-type is inspected: a dataset is not read.
 
-    :param array a: An array.
+    :param array a: An array, a dataset, or a data-type.
     :return: bool
     """
 
@@ -981,12 +1021,148 @@ def isnumeric(a):
     if isinstance(a, str):
         return False
 
+    if isinstance(a, np.dtype):
+        return np.issubdtype(a, np.number)
+
     if np.issubdtype(a.dtype, np.number):
         return True
 
     return False
 
 
+def _filters(dset: h5py.Dataset) -> list:
+    """
+    Filter pipeline of a dataset: ``[(code, flags, options, name), ...]``.
+    """
+    plist = dset.id.get_create_plist()
+    return [plist.get_filter(i) for i in range(plist.get_nfilters())]
+
+
+def _chunks(dset: h5py.Dataset) -> dict:
+    """
+    Storage information of all allocated chunks of a dataset, indexed by chunk offset.
+    """
+    ret = {}
+    if hasattr(dset.id, "chunk_iter"):
+        dset.id.chunk_iter(lambda info: ret.__setitem__(info.chunk_offset, info))
+    else:
+        for i in range(dset.id.get_num_chunks()):
+            info = dset.id.get_chunk_info(i)
+            ret[info.chunk_offset] = info
+    return ret
+
+
+def _equal_chunks(a: h5py.Dataset, b: h5py.Dataset) -> bool:
+    """
+    Check if two chunked datasets store byte-identical raw (e.g. compressed) chunks.
+    This avoids decompressing and converting the data.
+    ``False`` only means that equality could not be concluded this way.
+
+    Identical floating-point bytes are equal, as ``NaN`` compares equal to ``NaN``
+(see :py:func:`equal`).
+
+    :param a: A dataset.
+    :param b: A dataset.
+    :return: ``True`` if the stored data is identical.
+    """
+
+    if a.chunks is None or a.chunks != b.chunks:
+        return False
+
+    if a.shape != b.shape or a.dtype != b.dtype or a.dtype.kind not in "biufS":
+        return False
+
+    if a.fillvalue != b.fillvalue or _filters(a) != _filters(b):
+        return False
+
+    chunks_a = _chunks(a)
+    chunks_b = _chunks(b)
+
+    if chunks_a.keys() != chunks_b.keys():
+        return False
+
+    for offset, info in chunks_a.items():
+        if info.filter_mask != chunks_b[offset].filter_mask:
+            return False
+        if info.size != chunks_b[offset].size:
+            return False
+        if a.id.read_direct_chunk(offset)[1] != b.id.read_direct_chunk(offset)[1]:
+            return False
+
+    return True
+
+
+def _iter_blocks(a: h5py.Dataset, b: h5py.Dataset, size: int) -> Iterator:
+    """
+    Read two datasets of the same shape block-by-block along the first axis.
+    If ``a`` is chunked, blocks consist of whole chunks (of ``a``), such that no chunk is
+    decompressed more than once. If a single row of chunks does not fit in a block,
+    the datasets are read chunk-by-chunk.
+    If ``a`` is contiguous and a single row does not fit in a block,
+    each row is read in pieces along the second axis.
+    Otherwise, the same two buffers are reused for all blocks.
+
+    :param a: A dataset.
+    :param b: A dataset (same shape as ``a``).
+    :param size: Number of items per block (rounded to an integer number of rows).
+    :return: Iterator to pairs of arrays.
+    """
+
+    row = int(np.prod(a.shape[1:]))
+    step = 1 if a.chunks is None else a.chunks[0]
+
+    if a.chunks is not None and step * row > size:
+        for sel in a.iter_chunks():
+            yield a[sel], b[sel]
+        return
+
+    if row > size:
+        cols = max(1, size // int(np.prod(a.shape[2:])))
+        for i in range(a.shape[0]):
+            for start in range(0, a.shape[1], cols):
+                sel = np.s_[i, start : start + cols]
+                yield a[sel], b[sel]
+        return
+
+    rows = size // row // step * step
+    buf_a = np.empty((rows,) + a.shape[1:], dtype=a.dtype)
+    buf_b = np.empty((rows,) + b.shape[1:], dtype=b.dtype)
+
+    for start in range(0, a.shape[0], rows):
+        stop = min(start + rows, a.shape[0])
+        n = stop - start
+        a.read_direct(buf_a, np.s_[start:stop], np.s_[:n])
+        b.read_direct(buf_b, np.s_[start:stop], np.s_[:n])
+        yield buf_a[:n], buf_b[:n]
+
+
+# Datasets with more items than this are compared block-by-block (see _equal_value).
+_compare_blocksize = 1 << 20
+
+
+def _comparable(a: np.dtype, b: np.dtype, close: bool) -> bool:
+    """
+    Check if data of two types can be equal (based on the type only, no data is read).
+    See :py:func:`_equal_value`.
+
+    :param a: Type of the first dataset.
+    :param b: Type of the second dataset.
+    :param close: Allow ``float``-``int`` matches.
+    :return: ``False`` if the data cannot be equal.
+    """
+
+    if np.issubdtype(a, np.floating):
+        return close or np.issubdtype(b, np.floating)
+
+    if np.issubdtype(a, np.integer):
+        return close or np.issubdtype(b, np.integer)
+
+    if a == np.bool_:
+        return b == np.bool_
+
+    return isnumeric(a) == isnumeric(b)
+
+
 def _equal_value(a, b, close):
     import numpy as np
 
@@ -996,54 +1172,56 @@ def _equal_value(a, b, close):
         else:
             return False
 
+    if isinstance(b, str):
+        return False
+
     if a.size != b.size:
         return False
 
     if list(a.shape) != list(b.shape):
         return False
 
+    if not _comparable(a.dtype, b.dtype, close):
+        return False
+
+    if isinstance(a, h5py.Dataset) and isinstance(b, h5py.Dataset):
+        if _equal_chunks(a, b):
+            return True
+        if a.size > _compare_blocksize and a.dtype.kind != "O" and b.dtype.kind != "O":
+            blocks = _iter_blocks(a, b, _compare_blocksize)
+            return all(_equal_value(x, y, close) for x, y in blocks)
+
     if np.issubdtype(a.dtype, np.floating):
         if close:
-            return np.allclose(a, b)
-        if not np.issubdtype(b.dtype, np.floating):
-            return False
-        if np.allclose(a, b):
-            return True
-        return False
+            return np.allclose(a, b, equal_nan=True)
+        return np.array_equal(a[...], b[...], equal_nan=True)
 
     if np.issubdtype(a.dtype, np.integer):
-        if close:
-            return np.allclose(a, b)
-        if not np.issubdtype(b.dtype, np.integer):
-            return False
-        if a.shape != b.shape:
-            return False
-        if np.all(np.equal(a, b)):
-            return True
-        return False
+        if np.issubdtype(b.dtype, np.integer):
+            return np.array_equal(a[...], b[...])
+        return np.allclose(a, b, equal_nan=True)
 
     if a.dtype == np.bool_:
-        if b.dtype != np.bool_:
-            return False
-        if a.shape != b.shape:
-            return False
-        if np.all(np.equal(a, b)):
-            return True
-        return False
+        return np.array_equal(a[...], b[...])
 
-    if a.size == 1:
-        if a[...] == b[...]:
-            return True
-        else:
-            return False
+    numeric = isnumeric(a.dtype)
+    a = np.asarray(a[...])
+    b = np.asarray(b[...])
+
+    if a.dtype.kind == "O" or b.dtype.kind == "O":
+        return a.tolist() == b.tolist()
 
-    if close:
-        return np.allclose(np.array(list(a[...])), np.array(list(b[...])))
+    if close and numeric:
+        return np.allclose(a, b, equal_nan=True)
 
-    return np.all(np.array(list(a[...])) == np.array(list(b[...])))
+    return np.array_equal(a, b)
 
 
 def _equal(a, b, attrs, matching_dtype, shallow, close):
+    if not shallow and isinstance(a, h5py.Dataset) and isinstance(b, h5py.Dataset):
+        if a.shape != b.shape:
+            return False
+
     if attrs:
         for key in a.attrs:
             if key not in b.attrs:
@@ -1098,7 +1276,9 @@ def equal(
     :param attrs: Compare attributes (the same way at datasets).
     :param matching_dtype: Check that not only the data but also the type matches.
     :param shallow: Check only the presence of the dataset, not its value.
-    :param close: Use ``np.isclose`` also on ``float``-``int`` matches.
+    :param close:
+        Compare numerical data with ``np.allclose`` (also ``float``-``int`` matches).
+        By default, floating-point data has to match exactly (``NaN`` matches ``NaN``).
     """
 
     if not dest_dataset:
@@ -1107,13 +1287,16 @@ def equal(
     if root is not None:
         dest_dataset = join(root, dest_dataset, root=True)
 
-    if source_dataset not in source:
+    a = source.get(source_dataset)
+    b = dest.get(dest_dataset)
+
+    if a is None:
         raise OSError(f'"{source_dataset:s} not in {source.filename:s}')
 
-    if dest_dataset not in dest:
+    if b is None:
         raise OSError(f'"{dest_dataset:s} not in {dest.filename:s}')
 
-    return _equal(source[source_dataset], dest[dest_dataset], attrs, matching_dtype, shallow, close)
+    return _equal(a, b, attrs, matching_dtype, shallow, close)
 
 
 def allequal(
@@ -1195,17 +1378,11 @@ def _compare_paths(
             paths_b = list(getdatasets(b, max_depth=max_depth, fold=fold, fold_symbol=symbol))
 
     if fold:
-        fold = [join(f, symbol, root=True) for f in fold]
-
-        for path in paths_a:
-            if path in fold:
-                paths_a.remove(path)
-                fold_a.append(path.split(symbol)[0])
-
-        for path in paths_b:
-            if path in fold:
-                paths_b.remove(path)
-                fold_b.append(path.split(symbol)[0])
+        fold = {join(f, symbol, root=True) for f in fold}
+        fold_a = [path.split(symbol)[0] for path in paths_a if path in fold]
+        fold_b = [path.split(symbol)[0] for path in paths_b if path in fold]
+        paths_a = [path for path in paths_a if path not in fold]
+        paths_b = [path for path in paths_b if path not in fold]
 
     return paths_a, paths_b, fold_a, fold_b
 
@@ -1284,23 +1461,19 @@ def compare(
     :param max_depth: Set a maximum depth beyond which groups are folded.
     :param fold: Specify groups that are folded.
     :param list_folded: Return folded groups under `"??"`
-    :param close: Use ``np.isclose`` also on ``float``-``int`` matches.
+    :param close:
+        Compare numerical data with ``np.allclose`` (also ``float``-``int`` matches).
+        By default, floating-point data has to match exactly (``NaN`` matches ``NaN``).
     :return: Dictionary with difference.
     """
-    ret = {"<-": [], "->": [], "!=": [], "==": []}
     paths_a, paths_b, fold_a, fold_b = _compare_paths(
         a, b, paths_a, paths_b, False if only_datasets else attrs, max_depth, fold
     )
 
-    not_in_b = [str(i) for i in np.setdiff1d(paths_a, paths_b)]
-    not_in_a = [str(i) for i in np.setdiff1d(paths_b, paths_a)]
-    inboth = [str(i) for i in np.intersect1d(paths_a, paths_b)]
-
-    for path in not_in_a:
-        ret["<-"].append(path)
-
-    for path in not_in_b:
-        ret["->"].append(path)
+    paths_a = {str(i) for i in paths_a}
+    paths_b = {str(i) for i in paths_b}
+    inboth = sorted(paths_a & paths_b)
+    ret = {"<-": sorted(paths_b - paths_a), "->": sorted(paths_a - paths_b), "!=": [], "==": []}
 
     opts = dict(attrs=attrs, matching_dtype=matching_dtype, shallow=shallow, close=close)
 
@@ -1377,7 +1550,9 @@ def compare_rename(
     :param max_depth: Set a maximum depth beyond which groups are folded.
     :param fold: Specify groups that are folded.
     :param list_folded: Return folded groups under `"??"`
-    :param close: Use ``np.isclose`` also on ``float``-``int`` matches.
+    :param close:
+        Compare numerical data with ``np.allclose`` (also ``float``-``int`` matches).
+        By default, floating-point data has to match exactly (``NaN`` matches ``NaN``).
     :return: Dictionary with difference.
     """
 
@@ -1401,28 +1576,31 @@ def compare_rename(
 
     rename_a = []
     rename_b = []
+    set_a = set(paths_a)
+    set_b = set(paths_b)
 
     if not regex:
         for path_a, path_b in rename:
-            if path_a not in paths_a or path_b not in paths_b:
+            if path_a not in set_a or path_b not in set_b:
                 raise OSError("Renamed paths must be present")
             rename_a.append(path_a)
             rename_b.append(path_b)
     else:
         for pattern_a, pattern_b in rename:
+            regex_a = re.compile(rf"({pattern_a})(.*)")
+            replace = rf"{pattern_b}\2"
             for path_a in paths_a:
-                if re.match(rf"({pattern_a})(.*)", path_a):
-                    path_b = re.sub(rf"({pattern_a})(.*)", rf"{pattern_b}\2", path_a)
-                    if path_b not in paths_b:
+                if regex_a.match(path_a):
+                    path_b = regex_a.sub(replace, path_a)
+                    if path_b not in set_b:
                         continue
                     rename_a.append(path_a)
                     rename_b.append(path_b)
 
-    keep_a = ~np.in1d(paths_a, rename_a)
-    keep_b = ~np.in1d(paths_b, rename_b)
-
-    paths_a = np.array(paths_a)[keep_a]
-    paths_b = np.array(paths_b)[keep_b]
+    renamed_a = set(rename_a)
+    renamed_b = set(rename_b)
+    paths_a = [path for path in paths_a if path not in renamed_a]
+    paths_b = [path for path in paths_b if path not in renamed_b]
 
     ret = compare(a, b, paths_a, paths_b, **opts)
     ret_a = {"!=": [], "==": []}
@@ -1446,6 +1624,61 @@ def compare_rename(
     return ret, ret_a, ret_b
 
 
+def _open_readonly(filepath: str) -> h5py.File:
+    """
+    Open a file read-only with enlarged raw-data chunk and metadata caches.
+    Used by the command-line tools that walk (and read) the entire file.
+
+    :param filepath: Path to the file.
+    :return: The opened file.
+    """
+
+    file = h5py.File(filepath, "r", **_rdcc)
+    config = file.id.get_mdc_config()
+    config.set_initial_size = True
+    config.initial_size = 32 * 1024 * 1024
+    config.max_size = max(config.max_size, 128 * 1024 * 1024)
+    file.id.set_mdc_config(config)
+    return file
+
+
+def _dataset_info(data: h5py.Dataset) -> tuple[str, str, str]:
+    """
+    Size, shape, and dtype of a dataset (as strings).
+    The shape is read only once, the size is computed from it.
+    """
+    shape = data.shape
+    size = None if shape is None else int(np.prod(shape))
+    return str(size), str(shape), str(data.dtype)
+
+
+def _read_edges(dset: h5py.Dataset, index: tuple = (), axis: int = 0) -> np.ndarray:
+    """
+    Read only the part of a dataset that numpy shows when it summarizes the array.
+    Along each axis longer than ``2 * edgeitems`` the leading and trailing ``edgeitems`` are read,
+    separated by one placeholder item that is hidden when printed with
+    ``np.array2string(..., threshold=0)``.
+
+    :param dset: The dataset.
+    :param index: Selection of the preceding axes (internal use).
+    :param axis: Axis to select along (internal use).
+    :return: The edges of the dataset.
+    """
+
+    if axis == dset.ndim:
+        return dset[index]
+
+    n = dset.shape[axis]
+    edge = np.get_printoptions()["edgeitems"]
+
+    if n <= 2 * edge:
+        return _read_edges(dset, index + (slice(None),), axis + 1)
+
+    head = _read_edges(dset, index + (slice(0, edge),), axis + 1)
+    tail = _read_edges(dset, index + (slice(n - edge, n),), axis + 1)
+    return np.concatenate((head, np.take(head, [0], axis=axis), tail), axis=axis)
+
+
 def _linktype2str(source: h5py.File | h5py.Group, path: str) -> str:
     dset = source.get(path, getlink=True)
 
@@ -1468,16 +1701,16 @@ def print_plain(source, paths: list[str], show_links: bool = False):
     :param show_links: Show the path the link points to.
     """
 
+    lines = list(paths)
+
     if show_links:
-        for path in paths:
-            if isinstance(source.get(path, getlink=True), h5py.SoftLink):
-                print(path + " -> " + source.get(path, getlink=True).path)
-            else:
-                print(path)
-        return
+        for i, path in enumerate(lines):
+            link = source.get(path, getlink=True)
+            if isinstance(link, h5py.SoftLink):
+                lines[i] = f"{path} -> {link.path}"
 
-    for path in paths:
-        print(path)
+    if len(lines) > 0:
+        print("\n".join(lines))
 
 
 def info_table(source, paths: list[str], link_type: bool = False) -> prettytable.PrettyTable:
@@ -1495,39 +1728,27 @@ def info_table(source, paths: list[str], link_type: bool = False) -> prettytable
     :param link_type: Include the link-type in the output.
     """
 
-    def has_attributes(lst):
-        for i in lst:
-            if i != "-" and i != "0":
-                return True
-        return False
-
     header = ["path", "size", "shape", "dtype", "attrs"]
-    out = {key: [] for key in header}
+    rows = []
 
     for path in paths:
-        if path in source:
-            data = source[path]
-            out["path"] += [path]
-            out["attrs"] += [str(len(data.attrs))]
-            if isinstance(data, h5py.Dataset):
-                out["size"] += [str(data.size)]
-                out["shape"] += [str(data.shape)]
-                out["dtype"] += [str(data.dtype)]
-            else:
-                out["size"] += ["-"]
-                out["shape"] += ["-"]
-                out["dtype"] += ["-"]
+        data = source.get(path)
+        if data is None:
+            rows.append((path, "-", "-", "-", "-"))
+        elif isinstance(data, h5py.Dataset):
+            rows.append((path, *_dataset_info(data), str(_num_attrs(data))))
         else:
-            out["path"] += [path]
-            out["size"] += ["-"]
-            out["shape"] += ["-"]
-            out["dtype"] += ["-"]
-            out["attrs"] += ["-"]
+            rows.append((path, "-", "-", "-", str(_num_attrs(data))))
+
+    columns = zip(*rows) if len(rows) > 0 else [()] * len(header)
+    out = {key: list(column) for key, column in zip(header, columns)}
 
     if link_type:
         header.append("link")
         out["link"] = [_linktype2str(source, path) for path in paths]
 
+    import prettytable
+
     table = prettytable.PrettyTable()
     for key in header:
         table.add_column(column=out[key], fieldname=key, align="l")
@@ -1541,24 +1762,25 @@ def print_attribute(source, paths: list[str]):
     :param paths: List of paths.
     """
 
-    for path in paths:
-        if path in source:
-            data = source[path]
+    lines = []
 
-            print(f'"{path}"')
+    for path in paths:
+        data = source.get(path)
+        if data is not None:
+            lines.append(f'"{path}"')
 
             if isinstance(data, h5py.Dataset):
-                print(
-                    "- prop: size = {:s}, shape = {:s}, dtype = {:s}".format(
-                        str(data.size), str(data.shape), str(data.dtype)
-                    )
-                )
+                size, shape, dtype = _dataset_info(data)
+                lines.append(f"- prop: size = {size}, shape = {shape}, dtype = {dtype}")
 
             for key in data.attrs:
-                print("- attr: " + key + " = ")
-                print("        " + str(data.attrs[key]))
+                lines.append(f"- attr: {key} = ")
+                lines.append(f"        {data.attrs[key]}")
+
+            lines.append("")
 
-            print("")
+    if len(lines) > 0:
+        print("\n".join(lines))
 
 
 def _G5print_parser():
@@ -1595,27 +1817,26 @@ def G5print(args: list[str]):
         print("File does not exist")
         return 1
 
-    if args.full:
-        np.set_printoptions(threshold=sys.maxsize)
+    threshold = sys.maxsize if args.full else np.get_printoptions()["threshold"]
 
-    with h5py.File(args.source, "r") as source:
+    with _open_readonly(args.source) as source, np.printoptions(threshold=threshold):
         if len(args.dataset) == 0:
             print_header = True
             datasets = list(
                 getdatasets(source, root=args.root, max_depth=args.max_depth, fold=args.fold)
             )
-            datasets += list(getgroups(source, root=args.root, has_attrs=True))
+            if args.attrs:
+                datasets += getgroups(source, root=args.root, has_attrs=True)
             datasets = sorted(datasets)
         elif args.regex:
             print_header = True
             paths = list(
                 getdatasets(source, root=args.root, max_depth=args.max_depth, fold=args.fold)
             )
-            paths += list(getgroups(source, root=args.root, has_attrs=True))
-            datasets = []
-            for dataset in args.dataset:
-                datasets += [path for path in paths if re.match(dataset, path)]
-            datasets = sorted(datasets)
+            if args.attrs:
+                paths += getgroups(source, root=args.root, has_attrs=True)
+            patterns = [re.compile(dataset) for dataset in args.dataset]
+            datasets = sorted(path for path in paths if any(p.match(path) for p in patterns))
         else:
             datasets = args.dataset
             print_header = len(datasets) > 1
@@ -1630,24 +1851,21 @@ def G5print(args: list[str]):
 
             if args.info:
                 if isinstance(data, h5py.Dataset):
-                    print(
-                        "path = {:s}, size = {:s}, shape = {:s}, dtype = {:s}".format(
-                            dataset,
-                            str(data.size),
-                            str(data.shape),
-                            str(data.dtype),
-                        )
-                    )
+                    size, shape, dtype = _dataset_info(data)
+                    print(f"path = {dataset}, size = {size}, shape = {shape}, dtype = {dtype}")
                 else:
                     print(f"path = {dataset}")
             elif print_header:
                 print(dataset)
 
-            for key in data.attrs:
-                print(key + " : " + str(data.attrs[key]))
+            if args.attrs:
+                for key, value in data.attrs.items():
+                    print(f"{key} : {value}")
 
-            if isinstance(data, h5py.Dataset):
-                if not args.no_data:
+            if isinstance(data, h5py.Dataset) and not args.no_data:
+                if data.size is not None and data.size > np.get_printoptions()["threshold"]:
+                    print(np.array2string(_read_edges(data), threshold=0))
+                else:
                     print(data[...])
 
             if len(datasets) > 1 and i < len(datasets) - 1:
@@ -1698,26 +1916,26 @@ def G5list(args: list[str]):
     if not os.path.isfile(args.source):
         raise OSError(f'"{args.source}" does not exist')
 
-    with h5py.File(args.source, "r") as source:
+    with _open_readonly(args.source) as source:
         if args.layer is not None:
             paths = sorted(join(args.layer, i, root=True) for i in source[args.layer])
         else:
-            paths = list(getdatasets(source, **opts))
+            paths = set(getdatasets(source, **opts))
             if not args.datasets:
-                paths += getgroups(source, has_attrs=True, **opts)
-            paths = sorted(list(set(paths)))
+                paths.update(getgroups(source, has_attrs=True, **opts))
+            paths = sorted(paths)
 
         if args.min_attrs is not None:
-            rm = []
+            keep = []
             for path in paths:
-                if path in source:
-                    source[path]
-                    if len(source[path].attrs) < args.min_attrs:
-                        rm.append(path)
-            for path in rm:
-                paths.remove(path)
+                data = source.get(path)
+                if data is None or _num_attrs(data) >= args.min_attrs:
+                    keep.append(path)
+            paths = keep
 
         if args.info:
+            import prettytable
+
             table = info_table(source, paths, link_type=args.link_type)
             table.set_style(prettytable.SINGLE_BORDER)
             print(table.get_string(sortby=args.sort))
@@ -1727,6 +1945,32 @@ def G5list(args: list[str]):
             print_plain(source, paths, show_links=args.links)
 
 
+_G5compare_theme = {
+    "!=": ("cyan", ["bold"]),
+    "->": ("red", ["bold", "concealed"]),
+    "<-": ("green", ["bold"]),
+    "??": ("magenta", ["bold"]),
+}
+
+
+def _colored(text: str, color: str = None, attrs: list[str] = None) -> str:
+    """
+    Color text for terminal output.
+    Returns the text unchanged if no ``color`` is specified.
+
+    :param text: The text.
+    :param color: The color (see ``termcolor.colored``).
+    :param attrs: Text attributes (see ``termcolor.colored``).
+    :return: The (colored) text.
+    """
+    if not color:
+        return text
+
+    from termcolor import colored
+
+    return colored(text, color, attrs=attrs)
+
+
 def _G5compare_parser():
     """
     Return parser for :py:func:`G5compare`.
@@ -1746,7 +1990,9 @@ def _G5compare_parser():
         "-t", "--dtype", action="store_true", help="Verify that the type of the datasets match."
     )
     parser.add_argument(
-        "--close", action="store_true", help="Use ``np.isclose`` also on ``float``-``int`` matches."
+        "--close",
+        action="store_true",
+        help="Compare numerical data with ``np.allclose`` (default: exact match).",
     )
     parser.add_argument(
         "--shallow",
@@ -1785,6 +2031,8 @@ def G5compare(args: list[str]):
         return 0
 
     if args.renamed_yaml is not None:
+        import yaml
+
         with open(args.renamed_yaml) as file:
             ret = yaml.load(file.read(), Loader=yaml.FullLoader)
         assert type(ret) is dict
@@ -1792,7 +2040,7 @@ def G5compare(args: list[str]):
             args.renamed = []
         args.renamed += [[key, ret[key]] for key in ret]
 
-    with h5py.File(args.a, "r") as a, h5py.File(args.b, "r") as b:
+    with _open_readonly(args.a) as a, _open_readonly(args.b) as b:
         comp, r_a, r_b = compare_rename(
             a,
             b,
@@ -1808,31 +2056,16 @@ def G5compare(args: list[str]):
         )
 
     def def_row(arg, colors):
-        if colors == "none":
-            if arg[1] == "!=":
-                return arg
-            if arg[1] == "->":
-                return [arg[0], arg[1], ""]
-            if arg[1] == "<-":
-                return ["", arg[1], arg[2]]
-            if arg[1] == "??":
-                return [arg[0], arg[1], arg[2]]
-            if arg[1] != "==":
-                raise ValueError(f"Unknown operator {arg[1]}")
-
-        if arg[1] == "!=":
-            opts = dict(color="cyan", attrs=["bold"])
-            return [colored(arg[0], **opts), arg[1], colored(arg[2], **opts)]
-        if arg[1] == "->":
-            return [colored(arg[0], "red", attrs=["bold", "concealed"]), arg[1], ""]
-        if arg[1] == "<-":
-            return ["", arg[1], colored(arg[2], "green", attrs=["bold"])]
-        if arg[1] == "??":
-            opts = dict(color="magenta", attrs=["bold"])
-            return [colored(arg[0], **opts), arg[1], colored(arg[2], **opts)]
-        if arg[1] != "==":
+        if arg[1] not in _G5compare_theme:
             raise ValueError(f"Unknown operator {arg[1]}")
 
+        color, attrs = _G5compare_theme[arg[1]] if colors != "none" else (None, None)
+        left = _colored(arg[0], color, attrs) if arg[1] != "<-" else ""
+        right = _colored(arg[2], color, attrs) if arg[1] != "->" else ""
+        return [left, arg[1], right]
+
+    import prettytable
+
     out = prettytable.PrettyTable()
     if args.table == "PLAIN_COLUMNS":
         out.set_style(prettytable.PLAIN_COLUMNS)
@@ -1840,22 +2073,21 @@ def G5compare(args: list[str]):
         out.set_style(prettytable.SINGLE_BORDER)
     out.align = "l"
 
-    for key in comp:
-        if key != "==":
-            for item in comp[key]:
-                out.add_row(def_row([item, key, item], args.colors))
+    rows = [[item, key, item] for key in comp if key != "==" for item in comp[key]]
+    rows += [[path_a, "!=", path_b] for path_a, path_b in zip(r_a["!="], r_b["!="])]
+    rows = [def_row(row, "none") for row in rows]
 
-    for path_a, path_b in zip(r_a["!="], r_b["!="]):
-        out.add_row(def_row([path_a, "!=", path_b], args.colors))
+    for row in rows:
+        out.add_row(def_row(row, args.colors))
 
-    if len(out.rows) == 0:
+    if len(rows) == 0:
         print("No differences found")
         return
 
     cols = [args.a, args.b]
 
     if not args.input:
-        sizes = [max(len(row[0]) for row in out.rows), max(len(row[2]) for row in out.rows)]
+        sizes = [max(len(row[0]) for row in rows), max(len(row[2]) for row in rows)]
 
         if (len(cols[0]) > sizes[0] or len(cols[1]) > sizes[1]) and (
             len(cols[0]) + len(cols[1]) > 90
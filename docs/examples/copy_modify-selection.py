@@ -6,7 +6,7 @@ import GooseHDF5 as g5
 with h5py.File("foo.h5", "w") as file:
     file["/a"] = np.arange(5)
     file["/b/c"] = np.arange(5)
-    file["/d/e/f"] = np.arange(5)
+    file.create_dataset("/d/e/f", data=np.arange(5), chunks=(2,))
 
 with h5py.File("foo.h5", "r") as file:
     paths = list(g5.getdatasets(file))
@@ -14,6 +14,15 @@ with h5py.File("foo.h5", "r") as file:
 
     with h5py.File("bar.h5", "w") as ret:
         g5.copy(file, ret, paths)
-        ret["/d/e/f"] = file["/d/e/f"][...] * 2
+
+        # modify "/d/e/f" while copying, one chunk at a time (through one reusable buffer)
+        src = file["/d/e/f"]
+        dst = ret.create_dataset_like("/d/e/f", src)
+        buf = np.empty(src.chunks, dtype=src.dtype)
+        for sl in src.iter_chunks():
+            part = tuple(slice(0, s.stop - s.start) for s in sl)
+            src.read_direct(buf, sl, part)
+            np.multiply(buf, 2, out=buf)
+            dst.write_direct(buf, part, sl)
 
         print(g5.compare(file, ret, paths))
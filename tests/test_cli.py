@@ -13,8 +13,12 @@ import numpy as np
 import GooseHDF5 as g5
 
 
+_whitespace = re.compile(r"\s+")
+
+
 def _plain(text):
-    return list(filter(None, [re.sub(r"\s+", " ", line).strip() for line in text.splitlines()]))
+    lines = (_whitespace.sub(" ", line).strip() for line in text.splitlines())
+    return [line for line in lines if line]
 
 
 class MyTests(unittest.TestCase):
@@ -36,28 +40,30 @@ class MyTests(unittest.TestCase):
         Simple tests on G5list
         """
 
+        datasets = ["/a", "/b/a", "/b/b/a"]
+        data = np.random.default_rng(0).random([len(datasets), 25])
+
         with h5py.File("a.h5", "w") as file:
-            file["/a"] = np.random.random(25)
-            file["/b/a"] = np.random.random(25)
-            file["/b/b/a"] = np.random.random(25)
+            for path, row in zip(datasets, data):
+                file.create_dataset(path, data=row, track_times=False)
 
         with contextlib.redirect_stdout(io.StringIO()) as sio:
             g5.G5list(["a.h5"])
 
-        output = sorted(sio.getvalue().strip().splitlines())
-        expected = sorted(["/a", "/b/a", "/b/b/a"])
-        self.assertEqual(output, expected)
+        output = sio.getvalue().strip().splitlines()
+        self.assertCountEqual(output, datasets)
 
     def test_G5list_depth(self):
         """
         Simple tests on G5list
         """
 
+        datasets = ["/a", "/b/a", "/b/b/a", "/b/c/d/a"]
+        data = np.random.default_rng(0).random([len(datasets), 25])
+
         with h5py.File("a.h5", "w") as file:
-            file["/a"] = np.random.random(25)
-            file["/b/a"] = np.random.random(25)
-            file["/b/b/a"] = np.random.random(25)
-            file["/b/c/d/a"] = np.random.random(25)
+            for path, row in zip(datasets, data):
+                file.create_dataset(path, data=row, track_times=False)
 
             g = file.create_group("/c/a")
             g.attrs["foo"] = True
@@ -68,52 +74,50 @@ class MyTests(unittest.TestCase):
         with contextlib.redirect_stdout(io.StringIO()) as sio:
             g5.G5list(["-d", "1", "a.h5"])
 
-        output = sorted(sio.getvalue().strip().splitlines())
-        expected = sorted(["/a", "/b/...", "/c/...", "/d/..."])
-        self.assertEqual(output, expected)
+        output = sio.getvalue().strip().splitlines()
+        self.assertCountEqual(output, ["/a", "/b/...", "/c/...", "/d/..."])
 
         with contextlib.redirect_stdout(io.StringIO()) as sio:
             g5.G5list(["-d", "2", "a.h5"])
 
-        output = sorted(sio.getvalue().strip().splitlines())
-        expected = sorted(["/a", "/b/a", "/b/b/...", "/b/c/...", "/c/a", "/d/e/..."])
-        self.assertEqual(output, expected)
+        output = sio.getvalue().strip().splitlines()
+        self.assertCountEqual(output, ["/a", "/b/a", "/b/b/...", "/b/c/...", "/c/a", "/d/e/..."])
 
         with contextlib.redirect_stdout(io.StringIO()) as sio:
             g5.G5list(["-d", "3", "a.h5"])
 
-        output = sorted(sio.getvalue().strip().splitlines())
-        expected = sorted(["/a", "/b/a", "/b/b/a", "/b/c/d/...", "/c/a", "/d/e/a"])
-        self.assertEqual(output, expected)
+        output = sio.getvalue().strip().splitlines()
+        self.assertCountEqual(output, ["/a", "/b/a", "/b/b/a", "/b/c/d/...", "/c/a", "/d/e/a"])
 
         for i in range(4, 7):
             with contextlib.redirect_stdout(io.StringIO()) as sio:
                 g5.G5list(["-d", str(i), "a.h5"])
-            output = sorted(sio.getvalue().strip().splitlines())
-            expected = sorted(["/a", "/b/a", "/b/b/a", "/b/c/d/a", "/c/a", "/d/e/a"])
-            self.assertEqual(output, expected)
+            output = sio.getvalue().strip().splitlines()
+            self.assertCountEqual(output, ["/a", "/b/a", "/b/b/a", "/b/c/d/a", "/c/a", "/d/e/a"])
 
     def test_G5compare(self):
+        rng = np.random.default_rng(0)
+
         with h5py.File("a.hdf5", "w") as source, h5py.File("b.hdf5", "w") as other:
             # NumPy array
 
-            a = np.random.random(25)
+            a = rng.random(25)
 
             source["/a/equal"] = a
             source["/a/not_equal"] = a
 
             other["/a/equal"] = a
-            other["/a/not_equal"] = np.random.random(25)
+            other["/a/not_equal"] = rng.random(25)
 
             # single number
 
-            b = np.random.random(1)[0]
+            b = rng.random(1)[0]
 
             source["/b/equal"] = b
             source["/b/not_equal"] = b
 
             other["/b/equal"] = b
-            other["/b/not_equal"] = np.random.random(1)[0]
+            other["/b/not_equal"] = rng.random(1)[0]
 
             # string
 
@@ -127,24 +131,20 @@ class MyTests(unittest.TestCase):
 
             # alias
 
-            d = np.random.random(25)
+            d = rng.random(25)
 
             source["/d/equal"] = d
             other["/e/equal"] = d
 
             # attribute
 
-            f = np.random.random(25)
+            f = rng.random(25)
 
-            source["/f/equal"] = f
-            source["/f/equal"].attrs["key"] = f
-            source["/f/not_equal"] = f
-            source["/f/not_equal"].attrs["key"] = f
+            source.create_dataset("/f/equal", data=f).attrs["key"] = f
+            source.create_dataset("/f/not_equal", data=f).attrs["key"] = f
 
-            other["/f/equal"] = f
-            other["/f/equal"].attrs["key"] = f
-            other["/f/not_equal"] = f
-            other["/f/not_equal"].attrs["key"] = np.random.random(25)
+            other.create_dataset("/f/equal", data=f).attrs["key"] = f
+            other.create_dataset("/f/not_equal", data=f).attrs["key"] = rng.random(25)
 
             # meta (not present)
 
@@ -183,14 +183,15 @@ class MyTests(unittest.TestCase):
             "/present != /present",
             "/meta ->",
         ]
-        self.assertEqual(sorted(output[1:]), sorted(expected))
+        self.assertCountEqual(output[1:], expected)
 
     def test_G5print(self):
-        a = np.random.random(3)
+        rng = np.random.default_rng(0)
+
+        a = rng.random(3)
 
         with h5py.File("a.hdf5", "w") as source:
-            source["/a"] = a
-            source["/a"].attrs["desc"] = "Example"
+            source.create_dataset("/a", data=a).attrs["desc"] = "Example"
 
         with contextlib.redirect_stdout(io.StringIO()) as sio:
             g5.G5print(["a.hdf5", "/a", "-a"])
@@ -200,22 +201,70 @@ class MyTests(unittest.TestCase):
 
         self.assertEqual(output, expected)
 
+    def test_G5print_attrs(self):
+        """
+        Attributes (and groups that are only listed for their attributes) require ``-a``.
+        """
+
+        rng = np.random.default_rng(0)
+
+        a = rng.random(3)
+
+        with h5py.File("a.hdf5", "w") as source:
+            source.create_dataset("/a", data=a).attrs["desc"] = "Example"
+            source.create_group("/g").attrs["version"] = 1
+
+        with contextlib.redirect_stdout(io.StringIO()) as sio:
+            g5.G5print(["a.hdf5"])
+
+        self.assertEqual(sio.getvalue().splitlines(), ["/a", str(a)])
+
+        with contextlib.redirect_stdout(io.StringIO()) as sio:
+            g5.G5print(["a.hdf5", "-a"])
+
+        expected = ["/a", "desc : Example", str(a), "", "/g", "version : 1"]
+        self.assertEqual(sio.getvalue().splitlines(), expected)
+
+    def test_G5print_summarized(self):
+        """
+        Datasets larger than the print threshold are summarized as numpy would do.
+        """
+
+        rng = np.random.default_rng(0)
+
+        with h5py.File("a.hdf5", "w") as source:
+            source["/a"] = rng.random([50, 40])
+            source["/b"] = rng.random([10, 12, 15])
+            source["/c"] = rng.integers(0, 100, [50, 40])
+
+        for path in ["/a", "/b", "/c"]:
+            with contextlib.redirect_stdout(io.StringIO()) as sio:
+                g5.G5print(["a.hdf5", path])
+
+            with h5py.File("a.hdf5", "r") as source:
+                self.assertGreater(source[path].size, np.get_printoptions()["threshold"])
+                expected = str(source[path][...])
+
+            self.assertEqual(sio.getvalue(), expected + "\n")
+
     def test_G5modify_depth(self):
         """
         Simple tests on G5modify
         """
 
-        a = np.random.random([3, 2])
-        b = np.random.random([3, 2])
+        rng = np.random.default_rng(0)
+
+        a = rng.random([3, 2])
+        b = rng.random([3, 2])
 
         with h5py.File("a.h5", "w") as file:
             file["/a"] = np.zeros_like(a)
 
-        g5.G5modify(["a.h5", "a"] + [str(i) for i in a.ravel().tolist()])
+        g5.G5modify(["a.h5", "a"] + a.ravel().astype(str).tolist())
 
         args = ["a.h5", "b"]
-        args += [str(i) for i in b.ravel().tolist()]
-        args += ["--shape=" + ",".join([str(i) for i in b.shape])]
+        args += b.ravel().astype(str).tolist()
+        args += ["--shape=" + ",".join(map(str, b.shape))]
         g5.G5modify(args)
 
         with h5py.File("a.h5") as file:
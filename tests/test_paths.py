@@ -1,8 +1,6 @@
-import os
-import pathlib
-import shutil
-import tempfile
+import io
 import unittest
+from unittest import mock
 
 import h5py
 import numpy as np
@@ -13,60 +11,71 @@ import GooseHDF5 as g5
 class Test_iterator(unittest.TestCase):
     """ """
 
-    @classmethod
-    def setUpClass(self):
-        self.origin = pathlib.Path().absolute()
-        self.tempdir = tempfile.mkdtemp()
-        os.chdir(self.tempdir)
+    datasets = ["/a", "/b/foo", "/c/d/foo"]
 
     @classmethod
-    def tearDownClass(self):
-        os.chdir(self.origin)
-        shutil.rmtree(self.tempdir)
+    def setUpClass(self):
+        # file image shared by the path tests (each test gets its own copy)
 
-    def test_getdatasets(self):
-        datasets = ["/a", "/b/foo", "/c/d/foo"]
+        image = io.BytesIO()
 
-        with h5py.File("foo.h5", "w") as file:
-            for d in datasets:
+        with h5py.File(image, "w") as file:
+            for d in self.datasets:
                 file[d] = [0, 1, 2]
 
+        self.image = image.getvalue()
+
+    def open_image(self, mode="r"):
+        return h5py.File(io.BytesIO(self.image), mode)
+
+    def test_getdatasets(self):
+        with self.open_image() as file:
             paths = list(g5.getdatasets(file))
             paths_c = list(g5.getdatasets(file, root="/c"))
 
-        self.assertEqual(sorted(datasets), sorted(paths))
-        self.assertEqual(sorted([datasets[-1]]), sorted(paths_c))
+        self.assertEqual(sorted(self.datasets), sorted(paths))
+        self.assertEqual(sorted([self.datasets[-1]]), sorted(paths_c))
 
-    def test_getdatasets_fold(self):
-        datasets = ["/a", "/b/foo", "/c/d/foo"]
+    def test_getdatasets_softlink(self):
+        with h5py.File("foo.h5", "w", driver="core", backing_store=False) as file:
+            file["/a"] = [0, 1, 2]
+            file["/b/foo"] = [0, 1, 2]
+            file["/link/a"] = h5py.SoftLink("/a")
+            file["/link/b"] = h5py.SoftLink("/b")
+            file["/link/dangling"] = h5py.SoftLink("/nonexisting")
 
-        with h5py.File("foo.h5", "w") as file:
-            for d in datasets:
-                file[d] = [0, 1, 2]
+            paths = sorted(g5.getdatasets(file))
+            self.assertEqual(paths, ["/a", "/b/foo", "/link/a", "/link/b/foo"])
+
+            paths = sorted(g5.getdatasets(file, max_depth=2))
+            self.assertEqual(paths, ["/a", "/b/foo", "/link/a", "/link/b/..."])
+
+            paths = sorted(g5.getdatasets(file, fold="/b"))
+            self.assertEqual(paths, ["/a", "/b/...", "/link/a", "/link/b/foo"])
+
+            paths = sorted(g5.getdatasets(file, max_depth=2, fold="/b"))
+            self.assertEqual(paths, ["/a", "/b/...", "/link/a", "/link/b/..."])
 
-            paths = sorted(list(g5.getdatasets(file, fold="c")))
+            file["/link/external"] = h5py.ExternalLink("nonexisting.h5", "/a")
+
+            with self.assertRaises(RuntimeError):
+                list(g5.getdatasets(file))
+
+    def test_getdatasets_fold(self):
+        with self.open_image() as file:
+            paths = sorted(g5.getdatasets(file, fold="c"))
             self.assertEqual(paths, sorted(["/a", "/b/foo", "/c/..."]))
 
-            paths = sorted(list(g5.getdatasets(file, fold="/c", fold_symbol="")))
+            paths = sorted(g5.getdatasets(file, fold="/c", fold_symbol=""))
             self.assertEqual(paths, sorted(["/a", "/b/foo", "/c"]))
 
     def test_getgroups(self):
-        datasets = ["/a", "/b/foo", "/c/d/foo"]
-
-        with h5py.File("foo.h5", "w") as file:
-            for d in datasets:
-                file[d] = [0, 1, 2]
-
+        with self.open_image() as file:
             self.assertEqual(g5.getgroups(file), ["/b", "/c", "/c/d"])
             self.assertEqual(g5.getgroups(file, root="/c"), ["/c/d"])
 
     def test_getgroups_attrs(self):
-        datasets = ["/a", "/b/foo", "/c/d/foo"]
-
-        with h5py.File("foo.h5", "w") as file:
-            for d in datasets:
-                file[d] = [0, 1, 2]
-
+        with self.open_image("r+") as file:
             meta = file.create_group("meta")
             meta.attrs["version"] = 0
 
@@ -77,12 +86,7 @@ class Test_iterator(unittest.TestCase):
         Detect a group with attributes at a certain depth, but fold it
         """
 
-        datasets = ["/a", "/b/foo", "/c/d/foo"]
-
-        with h5py.File("foo.h5", "w") as file:
-            for d in datasets:
-                file[d] = [0, 1, 2]
-
+        with self.open_image("r+") as file:
             meta = file.create_group("meta").create_group("at").create_group("depth")
             meta.attrs["version"] = 0
 
@@ -94,26 +98,30 @@ class Test_iterator(unittest.TestCase):
                 self.assertEqual(paths, ["/meta" + symbol])
 
     def test_compare(self):
-        with h5py.File("a.h5", "w") as source, h5py.File("b.h5", "w") as other:
+        data = np.random.default_rng(0).random([8, 25])
+
+        kwargs = dict(driver="core", backing_store=False)
+
+        with h5py.File("a.h5", "w", **kwargs) as source, h5py.File("b.h5", "w", **kwargs) as other:
             # NumPy array
 
-            a = np.random.random(25)
+            a = data[0]
 
             source["/a/equal"] = a
             source["/a/ne_data"] = a
 
             other["/a/equal"] = a
-            other["/a/ne_data"] = np.random.random(25)
+            other["/a/ne_data"] = data[1]
 
             # single number
 
-            b = np.random.random(1)[0]
+            b = data[2, 0]
 
             source["/b/equal"] = b
             source["/b/ne_data"] = b
 
             other["/b/equal"] = b
-            other["/b/ne_data"] = np.random.random(1)[0]
+            other["/b/ne_data"] = data[3, 0]
 
             # string
 
@@ -127,21 +135,17 @@ class Test_iterator(unittest.TestCase):
 
             # attribute
 
-            d = np.random.random(25)
+            d = data[4]
 
-            source["/d/equal"] = d
-            source["/d/equal"].attrs["key"] = d
-            source["/d/ne_attr"] = d
-            source["/d/ne_attr"].attrs["key"] = d
+            source.create_dataset("/d/equal", data=d).attrs["key"] = d
+            source.create_dataset("/d/ne_attr", data=d).attrs["key"] = d
 
-            other["/d/equal"] = d
-            other["/d/equal"].attrs["key"] = d
-            other["/d/ne_attr"] = d
-            other["/d/ne_attr"].attrs["key"] = np.random.random(25)
+            other.create_dataset("/d/equal", data=d).attrs["key"] = d
+            other.create_dataset("/d/ne_attr", data=d).attrs["key"] = data[5]
 
             # dtyoe
 
-            e = (100.0 * np.random.random(25)).astype(int)
+            e = (100.0 * data[6]).astype(int)
 
             source["/e/equal"] = e
             source["/e/ne_dtype"] = e
@@ -151,17 +155,13 @@ class Test_iterator(unittest.TestCase):
 
             # dtyoe attribute
 
-            f = (100.0 * np.random.random(25)).astype(int)
+            f = (100.0 * data[7]).astype(int)
 
-            source["/f/equal"] = f
-            source["/f/equal"].attrs["key"] = f
-            source["/f/ne_dtype_attr"] = f
-            source["/f/ne_dtype_attr"].attrs["key"] = f
+            source.create_dataset("/f/equal", data=f).attrs["key"] = f
+            source.create_dataset("/f/ne_dtype_attr", data=f).attrs["key"] = f
 
-            other["/f/equal"] = f
-            other["/f/equal"].attrs["key"] = f
-            other["/f/ne_dtype_attr"] = f
-            other["/f/ne_dtype_attr"].attrs["key"] = f.astype(float)
+            other.create_dataset("/f/equal", data=f).attrs["key"] = f
+            other.create_dataset("/f/ne_dtype_attr", data=f).attrs["key"] = f.astype(float)
 
             # attribute (not present)
 
@@ -241,27 +241,14 @@ class Test_iterator(unittest.TestCase):
             ],
         }
 
-        for key in expected_all:
-            expected_all[key] = sorted(expected_all[key])
-
-        for key in expected_all_shallow:
-            expected_all_shallow[key] = sorted(expected_all_shallow[key])
-
-        for key in expected_datasets:
-            expected_datasets[key] = sorted(expected_datasets[key])
-
-        for key in check_all:
-            check_all[key] = sorted(check_all[key])
-
-        for key in check_all_shallow:
-            check_all_shallow[key] = sorted(check_all_shallow[key])
-
-        for key in check_datasets:
-            check_datasets[key] = sorted(check_datasets[key])
-
-        self.assertEqual(expected_all, check_all)
-        self.assertEqual(expected_all_shallow, check_all_shallow)
-        self.assertEqual(expected_datasets, check_datasets)
+        for expected, check in [
+            (expected_all, check_all),
+            (expected_all_shallow, check_all_shallow),
+            (expected_datasets, check_datasets),
+        ]:
+            self.assertEqual(expected.keys(), check.keys())
+            for key in expected:
+                self.assertCountEqual(expected[key], check[key])
 
     def test_compare_allow(self):
         a = {"->": [], "<-": [], "==": [], "!=": ["/foo/bar"]}
@@ -271,19 +258,139 @@ class Test_iterator(unittest.TestCase):
         self.assertEqual(g5.compare_allow(a, "/foo/bar"), e)
         self.assertEqual(g5.compare_allow(a, "bar", root="/foo"), e)
 
+    def test_compare_close(self):
+        kwargs = dict(driver="core", backing_store=False)
+
+        with h5py.File("a.h5", "w", **kwargs) as source, h5py.File("b.h5", "w", **kwargs) as other:
+            a = np.linspace(0, 1, 25)
+
+            source["/equal"] = a
+            source["/close"] = a
+
+            other["/equal"] = a
+            other["/close"] = a + 1e-12
+
+            ret = g5.compare(source, other)
+            self.assertEqual(ret["=="], ["/equal"])
+            self.assertEqual(ret["!="], ["/close"])
+
+            ret = g5.compare(source, other, close=True)
+            self.assertCountEqual(ret["=="], ["/equal", "/close"])
+            self.assertEqual(ret["!="], [])
+
+    def test_compare_nan(self):
+        kwargs = dict(driver="core", backing_store=False)
+
+        with h5py.File("a.h5", "w", **kwargs) as source, h5py.File("b.h5", "w", **kwargs) as other:
+            a = np.array([0.0, np.nan, 1.0])
+
+            for file in [source, other]:
+                file["/contiguous"] = a
+                file.create_dataset("/chunked", data=a, chunks=(2,))
+
+            for close in [False, True]:
+                ret = g5.compare(source, other, close=close)
+                self.assertCountEqual(ret["=="], ["/contiguous", "/chunked"])
+                self.assertEqual(ret["!="], [])
+
+    def test_equal_blocks(self):
+        """
+        Compare large datasets block-by-block (threshold lowered to test small datasets).
+        A block size of 4 is smaller than one row (of 6 items).
+        The raw-chunk shortcut is disabled, such that the data is always read.
+        """
+
+        data = np.random.default_rng(0).random([40, 6])
+        other = data.copy()
+        other[-1, -1] += 1
+        kwargs = dict(driver="core", backing_store=False)
+
+        for chunks in [None, (4, 6), (40, 2)]:
+            with h5py.File("a.h5", "w", **kwargs) as a, h5py.File("b.h5", "w", **kwargs) as b:
+                a.create_dataset("equal", data=data, chunks=chunks)
+                b.create_dataset("equal", data=data, chunks=chunks)
+                a.create_dataset("not_equal", data=data, chunks=chunks)
+                b.create_dataset("not_equal", data=other, chunks=chunks)
+                a.create_dataset("dtype", data=data, chunks=chunks)
+                b.create_dataset("dtype", data=data.astype(int), chunks=chunks)
+
+                for blocksize in [30, 4]:
+                    with mock.patch.object(g5, "_compare_blocksize", blocksize), mock.patch.object(
+                        g5, "_equal_chunks", return_value=False
+                    ), mock.patch.object(g5, "_iter_blocks", wraps=g5._iter_blocks) as blocks:
+                        self.assertTrue(g5.equal(a, b, "equal"))
+                        self.assertFalse(g5.equal(a, b, "not_equal"))
+                        self.assertEqual(blocks.call_count, 2)
+                        self.assertFalse(g5.equal(a, b, "dtype"))
+                        self.assertEqual(blocks.call_count, 2)
+
+    def test_equal_chunks(self):
+        """
+        Compare chunked integer datasets by their raw (compressed) chunks.
+        """
+
+        data = np.arange(100).reshape(10, 10)
+        other = data.copy()
+        other[-1, -1] += 1
+        kwargs = dict(driver="core", backing_store=False)
+        opts = dict(chunks=(5, 5), compression="gzip")
+
+        with h5py.File("a.h5", "w", **kwargs) as a, h5py.File("b.h5", "w", **kwargs) as b:
+            # identical: shortcut applies
+
+            a.create_dataset("equal", data=data, **opts)
+            b.create_dataset("equal", data=data, **opts)
+            self.assertTrue(g5._equal_chunks(a["equal"], b["equal"]))
+            self.assertTrue(g5.equal(a, b, "equal"))
+
+            # one chunk differs
+
+            a.create_dataset("not_equal", data=data, **opts)
+            b.create_dataset("not_equal", data=other, **opts)
+            self.assertFalse(g5._equal_chunks(a["not_equal"], b["not_equal"]))
+            self.assertFalse(g5.equal(a, b, "not_equal"))
+
+            # different filters or chunk shape: fall back to comparing the data
+
+            a.create_dataset("filters", data=data, **opts)
+            b.create_dataset("filters", data=data, chunks=(5, 5))
+            self.assertFalse(g5._equal_chunks(a["filters"], b["filters"]))
+            self.assertTrue(g5.equal(a, b, "filters"))
+
+            a.create_dataset("chunks", data=data, **opts)
+            b.create_dataset("chunks", data=data, chunks=(10, 2), compression="gzip")
+            self.assertFalse(g5._equal_chunks(a["chunks"], b["chunks"]))
+            self.assertTrue(g5.equal(a, b, "chunks"))
+
+            # partly unallocated: compare allocated chunks, or fall back
+
+            for dset in [a, b]:
+                dset.create_dataset("partial", shape=(10, 10), dtype=int, **opts)
+                dset["partial"][:5, :5] = data[:5, :5]
+            self.assertTrue(g5._equal_chunks(a["partial"], b["partial"]))
+            self.assertTrue(g5.equal(a, b, "partial"))
+
+            b["partial"][5:, 5:] = 0
+            self.assertFalse(g5._equal_chunks(a["partial"], b["partial"]))
+            self.assertTrue(g5.equal(a, b, "partial"))
+
     def test_compare_fold(self):
         """
         Compare only data that is not ignored because is it too deep or folded.
         """
 
-        with h5py.File("a.h5", "w") as source, h5py.File("b.h5", "w") as other:
-            a = np.random.random(25)
+        rng = np.random.default_rng(0)
+
+        kwargs = dict(driver="core", backing_store=False)
+
+        with h5py.File("a.h5", "w", **kwargs) as source, h5py.File("b.h5", "w", **kwargs) as other:
+            a = rng.random(25)
 
             source["/equal/at/some/depth"] = a
             source["/different/at/some/depth"] = a
 
             other["/equal/at/some/depth"] = a
-            other["/different/at/some/depth"] = np.random.random(25)
+            other["/different/at/some/depth"] = rng.random(25)
 
             ret = g5.compare(source, other, fold="different")
 